@@ -0,0 +1,289 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Skill name -> pattern; R is matched case-sensitively so "r" inside words and "R&D" don't count
+SKILL_PATTERNS = {
+    'Python': re.compile(r'\bpython\b', re.I),
+    'R': re.compile(r'\bR\b(?!&)'),
+    'SQL': re.compile(r'\bsql\b', re.I),
+    'Excel': re.compile(r'\bexcel\b', re.I),
+    'VBA': re.compile(r'\bvba\b', re.I),
+    'SAS': re.compile(r'\bsas\b', re.I),
+    'Tableau': re.compile(r'\btableau\b', re.I),
+    'Power BI': re.compile(r'\bpower\s?bi\b', re.I),
+    'Prophet': re.compile(r'\bprophet\b', re.I),
+    'AXIS': re.compile(r'\baxis\b', re.I),
+    'MoSes': re.compile(r'\bmoses\b', re.I),
+    'Emblem': re.compile(r'\bemblem\b', re.I),
+    'Predictive Modeling': re.compile(r'\bpredictive model', re.I),
+    'Machine Learning': re.compile(r'\bmachine learning\b', re.I),
+}
+
+SALARY_PATTERN = re.compile(r'\$\s?(\d+(?:\.\d+)?)\s?(k)?\s?[-–]\s?\$?\s?(\d+(?:\.\d+)?)\s?(k)?', re.I)
+YEARS_PATTERN = re.compile(r'(\d+)\s*\+?\s*(?:-\s*\d+\s*)?years?', re.I)
+INTERN_TITLE = re.compile(r'\b(intern|internship|co-op|student)\b', re.I)
+SENIOR_TITLE = re.compile(r'\b(senior|sr|lead|principal|director|head|chief|vp)\b', re.I)
+ENTRY_TITLE = re.compile(r'\b(entry|junior|jr|graduate|trainee)\b', re.I)
+
+# Fields only a detail page can provide
+DETAIL_FIELDS = ['description', 'skills_required', 'experience_level']
+
+def drop_detail_fields(job):
+    """Copy of job without the detail page fields.
+
+    Used when a page could not be read, so ingest leaves whatever the
+    database already holds for them instead of overwriting it with blanks
+    or the listing's placeholder description.
+    """
+    return {field: value for field, value in job.items() if field not in DETAIL_FIELDS}
+
+class HostRateLimiter:
+    """Spaces out requests to the same host across all worker threads"""
+
+    def __init__(self, requests_per_second=4.0):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self.next_slot = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        """Block until a request to url's host is allowed"""
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class ResponseCache:
+    """On-disk cache of page bodies keyed by URL, revalidated with ETag/Last-Modified"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, url, entry):
+        tmp_path = self._path(url) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(url))
+
+    def put(self, url, response):
+        entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'body': response.text
+        }
+        self._write(url, entry)
+        return entry
+
+    def touch(self, url, entry):
+        """Mark a cached entry as freshly revalidated"""
+        entry['fetched_at'] = time.time()
+        self._write(url, entry)
+
+def _find_description(value):
+    """Longest string stored under a 'description' key in nested page data"""
+    best = ''
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key.lower() == 'description' and isinstance(item, str) and len(item) > len(best):
+                best = item
+            else:
+                found = _find_description(item)
+                if len(found) > len(best):
+                    best = found
+    elif isinstance(value, list):
+        for item in value:
+            found = _find_description(item)
+            if len(found) > len(best):
+                best = found
+    return best
+
+def _html_to_text(html):
+    return BeautifulSoup(html, 'html.parser').get_text('\n', strip=True)
+
+def parse_salary(text):
+    """(salary_min, salary_max) from text like "$134k-$254k", else (None, None)"""
+    match = SALARY_PATTERN.search(text or '')
+    if not match:
+        return None, None
+    low, low_k, high, high_k = match.groups()
+    # "$90-120k" puts the k only on the upper bound
+    low_k = low_k or high_k
+    salary_min = float(low) * (1000 if low_k else 1)
+    salary_max = float(high) * (1000 if high_k else 1)
+    return salary_min, salary_max
+
+def parse_skills(text):
+    """Comma-separated skills mentioned in text, or None"""
+    skills = [name for name, pattern in SKILL_PATTERNS.items() if pattern.search(text or '')]
+    return ', '.join(skills) if skills else None
+
+def parse_experience_level(title, text):
+    """intern, entry, mid or senior from the title, else from years of experience asked"""
+    title = title or ''
+    if INTERN_TITLE.search(title):
+        return 'intern'
+    if SENIOR_TITLE.search(title):
+        return 'senior'
+    if ENTRY_TITLE.search(title):
+        return 'entry'
+
+    years = [int(found) for found in YEARS_PATTERN.findall(text or '') if int(found) < 40]
+    if years:
+        required = min(years)
+        if required >= 7:
+            return 'senior'
+        if required >= 3:
+            return 'mid'
+        return 'entry'
+    return None
+
+def parse_detail_page(html, title=None):
+    """Pull description, skills, experience level and salary out of a job detail page"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    description = ''
+    # Next.js pages ship the job record as JSON, which is cleaner than the rendered markup
+    next_data = soup.find('script', id='__NEXT_DATA__')
+    if next_data and next_data.string:
+        try:
+            description = _html_to_text(_find_description(json.loads(next_data.string)))
+        except ValueError:
+            description = ''
+    if not description:
+        container = soup.find(class_=re.compile('description', re.I)) or soup.find('article') or soup.find('main')
+        if container:
+            description = container.get_text('\n', strip=True)
+    if not description:
+        meta = soup.find('meta', attrs={'name': 'description'}) or soup.find('meta', attrs={'property': 'og:description'})
+        if meta and meta.get('content'):
+            description = meta['content'].strip()
+
+    if not title:
+        title_elem = soup.find('h1')
+        title = title_elem.get_text(' ', strip=True) if title_elem else ''
+    # Only the description, so salaries of related jobs in the sidebar don't leak in
+    salary_min, salary_max = parse_salary(description)
+
+    return {
+        'description': description or None,
+        'skills_required': parse_skills(description),
+        'experience_level': parse_experience_level(title, description),
+        'salary_min': salary_min,
+        'salary_max': salary_max
+    }
+
+class DetailPageEnricher:
+    """Fetches job detail pages concurrently and fills in the fields the listing lacks.
+
+    The rate limit is per host, and every Actuary List detail page is on one
+    host, so requests_per_second caps the whole stage. Workers only overlap
+    the waiting: throughput reaches the cap once max_workers is at least
+    requests_per_second times the page latency, and extra workers add nothing.
+    """
+
+    def __init__(self, max_workers=8, requests_per_second=4.0, cache_dir=None,
+                 cache_ttl=6 * 3600, timeout=15):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.cache = ResponseCache(cache_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), '.detail_cache'))
+
+        # One pooled session shared by all workers, with a connection per worker
+        self.http = requests.Session()
+        self.http.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.http.mount('http://', adapter)
+        self.http.mount('https://', adapter)
+
+    def fetch(self, url):
+        """Return the page body for url, from cache when it is still valid.
+
+        If the request fails and an older copy is cached, that copy is used.
+        """
+        cached = self.cache.get(url)
+        if cached and time.time() - cached.get('fetched_at', 0) < self.cache_ttl:
+            return cached['body']
+
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+        self.rate_limiter.wait(url)
+        try:
+            response = self.http.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and cached:
+                self.cache.touch(url, cached)
+                return cached['body']
+            response.raise_for_status()
+        except requests.RequestException as e:
+            if not cached:
+                raise
+            print(f"⚠️ Using cached copy of {url}: {e}")
+            return cached['body']
+        return self.cache.put(url, response)['body']
+
+    def enrich_job(self, job):
+        """Return a copy of job with detail page fields filled in, or left out if the page can't be read"""
+        enriched = job.copy()
+
+        # Listing locations often carry the range already, e.g. "💰 $134k-$254k"
+        salary_min, salary_max = parse_salary(job.get('location'))
+        if salary_min is not None:
+            enriched['salary_min'] = salary_min
+            enriched['salary_max'] = salary_max
+
+        url = job.get('application_url')
+        if not url:
+            return drop_detail_fields(enriched)
+        try:
+            details = parse_detail_page(self.fetch(url), job.get('title'))
+        except (requests.RequestException, OSError) as e:
+            print(f"⚠️ Could not fetch details for {url}: {e}")
+            return drop_detail_fields(enriched)
+
+        has_listing_salary = salary_min is not None
+        for field, value in details.items():
+            if value is None:
+                continue
+            if field in ('salary_min', 'salary_max') and has_listing_salary:
+                continue
+            enriched[field] = value
+        return enriched
+
+    def enrich_jobs(self, jobs):
+        """Enrich all jobs through the worker pool, keeping their order"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(self.enrich_job, jobs))
+
+    def close(self):
+        self.http.close()
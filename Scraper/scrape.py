@@ -16,8 +16,10 @@ import sys
 # Add parent directory to path to import backend modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.models.job import Job
-from backend.db import engine
+from backend.db import engine, init_db
+from backend.snapshot import diff_snapshots, apply_changeset, load_state
 from sqlalchemy.orm import sessionmaker
+from enrich import DetailPageEnricher, drop_detail_fields
 
 class ActuaryListScraper:
     def __init__(self, headless=True):
@@ -74,43 +76,81 @@ class ActuaryListScraper:
         
         return today
     
+    # Job type words as they appear in a title, e.g. "Actuarial Intern", "Contract Actuary"
+    TITLE_JOB_TYPES = [
+        ('internship', re.compile(r'\b(intern|internship|co-op)\b', re.I)),
+        ('part-time', re.compile(r'\bpart[- ]?time\b', re.I)),
+        ('contract', re.compile(r'\b(contract|contractor|freelance|temporary)\b', re.I)),
+        ('full-time', re.compile(r'\bfull[- ]?time\b', re.I)),
+    ]
+    # Explicit employment-type phrases in a description; bare words like
+    # "contracts" or "international" say nothing about the role itself
+    DESCRIPTION_JOB_TYPES = [
+        ('full-time', re.compile(r'\b(full[- ]?time|permanent (role|position))\b', re.I)),
+        ('part-time', re.compile(r'\bpart[- ]?time\b', re.I)),
+        ('contract', re.compile(r'\b(contract (role|position|basis|assignment)|fixed[- ]term|contractor|freelance)\b', re.I)),
+        ('internship', re.compile(r'\b(internship|summer intern)\b', re.I)),
+    ]
+    
     def infer_job_type(self, title, description, tags):
-        """Infer job type from title, description, and tags"""
-        text = f"{title} {description} {tags}".lower()
-        
-        if any(word in text for word in ['intern', 'internship']):
-            return 'internship'
-        elif any(word in text for word in ['part-time', 'part time', 'parttime']):
-            return 'part-time'
-        elif any(word in text for word in ['contract', 'contractor', 'freelance']):
-            return 'contract'
-        elif any(word in text for word in ['full-time', 'full time', 'fulltime']):
-            return 'full-time'
-        else:
-            return 'full-time'  # Default assumption
+        """Infer job type from title and tags, then from explicit phrases in the description"""
+        listing = f"{title} {tags}"
+        for job_type, pattern in self.TITLE_JOB_TYPES:
+            if pattern.search(listing):
+                return job_type
+        for job_type, pattern in self.DESCRIPTION_JOB_TYPES:
+            if pattern.search(description or ''):
+                return job_type
+        return 'full-time'  # Default assumption
+    
+    # Common actuarial tags as (tag, pattern, also taken from the description).
+    # Domain, role and work-arrangement words count in the title only, since
+    # descriptions mention life and health insurance or remote days in their
+    # benefits sections; tools and practice areas are explicit enough to take
+    # from either. R is matched case-sensitively so "r" inside words and
+    # "R&D" don't count.
+    TAG_PATTERNS = [
+        ('Life', re.compile(r'\blife\b', re.I), False),
+        ('Health', re.compile(r'\bhealth\b', re.I), False),
+        ('Pricing', re.compile(r'\bpricing\b', re.I), True),
+        ('Reserving', re.compile(r'\breserving\b', re.I), True),
+        ('Modeling', re.compile(r'\bmodell?ing\b', re.I), True),
+        ('Analytics', re.compile(r'\banalytics\b', re.I), True),
+        ('Python', re.compile(r'\bpython\b', re.I), True),
+        ('R', re.compile(r'\bR\b(?!&)'), True),
+        ('Sql', re.compile(r'\bsql\b', re.I), True),
+        ('Excel', re.compile(r'\bexcel\b', re.I), True),
+        ('Vba', re.compile(r'\bvba\b', re.I), True),
+        ('Sas', re.compile(r'\bsas\b', re.I), True),
+        ('Tableau', re.compile(r'\btableau\b', re.I), True),
+        ('Power Bi', re.compile(r'\bpower\s?bi\b', re.I), True),
+        ('Entry Level', re.compile(r'\bentry[- ]level\b', re.I), True),
+        ('Analyst', re.compile(r'\banalyst\b', re.I), False),
+        ('Actuary', re.compile(r'\bactuary\b', re.I), False),
+        ('Fellow', re.compile(r'\bfellow\b', re.I), False),
+        ('Associate', re.compile(r'\bassociate\b', re.I), False),
+        ('Remote', re.compile(r'\bremote\b', re.I), False),
+        ('Hybrid', re.compile(r'\bhybrid\b', re.I), False),
+        ('Onsite', re.compile(r'\bon-?site\b', re.I), False),
+        ('Consulting', re.compile(r'\bconsulting\b', re.I), False),
+        ('Insurance', re.compile(r'\binsurance\b', re.I), False),
+    ]
     
     def extract_tags(self, title, description, location):
-        """Extract relevant tags from job content"""
+        """Extract relevant tags from the title, the description and the work arrangement in the location"""
         tags = []
-        text = f"{title} {description}".lower()
-        
-        # Common actuarial tags
-        actuarial_tags = [
-            'life', 'health', 'pricing', 'reserving', 'modeling', 'analytics',
-            'python', 'r', 'sql', 'excel', 'vba', 'sas', 'tableau', 'power bi',
-            'entry level', 'analyst', 'actuary', 'fellow', 'associate',
-            'remote', 'hybrid', 'onsite', 'consulting', 'insurance'
-        ]
-        
-        for tag in actuarial_tags:
-            if tag in text:
-                tags.append(tag.title())
+        for tag, pattern, in_description in self.TAG_PATTERNS:
+            if pattern.search(title) or (in_description and pattern.search(description or '')):
+                tags.append(tag)
         
         # Add location-based tags
-        if 'remote' in location.lower():
-            tags.append('Remote')
-        elif 'hybrid' in location.lower():
-            tags.append('Hybrid')
+        location_tag = None
+        if re.search(r'\bremote\b', location or '', re.I):
+            location_tag = 'Remote'
+        elif re.search(r'\bhybrid\b', location or '', re.I):
+            location_tag = 'Hybrid'
+        if location_tag and location_tag not in tags:
+            tags.append(location_tag)
         
         return ', '.join(tags) if tags else None
     
@@ -229,36 +269,56 @@ class ActuaryListScraper:
             print(f"⚠️ Error parsing article: {e}")
             return None
     
-    def save_jobs_to_db(self, jobs):
-        """Save scraped jobs to database with duplicate checking"""
-        saved_count = 0
-        skipped_count = 0
+    # Re-derived from the description once there is one, so they are only
+    # sent to the database together with it
+    DESCRIPTION_DERIVED_FIELDS = ['job_type', 'tags']
+    
+    def drop_description_fields(self, job):
+        """Copy of job without the detail page fields or the ones derived from them.
         
-        # for job_data in jobs:
-        #     try:
-        #         # Check if job already exists (by title, company, and location)
-        #         existing_job = self.session.query(Job).filter(
-        #             Job.title == job_data['title'],
-        #             Job.company == job_data['company'],
-        #             Job.location == job_data['location']
-        #         ).first()
-                
-        #         if not existing_job:
-        #             job = Job(**job_data)
-        #             self.session.add(job)
-        #             saved_count += 1
-        #         else:
-        #             skipped_count += 1
-                    
-            # except Exception as e:
-            #     print(f"❌ Error saving job: {e}")
-            #     continue
+        Listing-only tags and job type would differ from the ones already
+        stored for an enriched job, change its content hash and overwrite
+        them, so they are left out along with the description.
+        """
+        job = drop_detail_fields(job)
+        for field in self.DESCRIPTION_DERIVED_FIELDS:
+            job.pop(field, None)
+        return job
+    
+    def enrich_jobs(self, jobs, max_workers=8, requests_per_second=4.0):
+        """Fill description, skills, experience level and salary from each job's detail page"""
+        print(f"🔎 Fetching {len(jobs)} detail pages with {max_workers} workers...")
+        enricher = DetailPageEnricher(max_workers=max_workers, requests_per_second=requests_per_second)
+        try:
+            enriched_jobs = enricher.enrich_jobs(jobs)
+        finally:
+            enricher.close()
         
+        # Re-derive job type and tags now that there is a real description
+        for i, job in enumerate(enriched_jobs):
+            if 'description' not in job:
+                enriched_jobs[i] = self.drop_description_fields(job)
+                continue
+            job['job_type'] = self.infer_job_type(job['title'], job['description'], job.get('tags') or '')
+            job['tags'] = self.extract_tags(job['title'], job['description'], job['location'])
+        
+        described = sum(1 for job in enriched_jobs if 'description' in job)
+        print(f"📝 Enriched {described} of {len(enriched_jobs)} jobs from their detail pages")
+        return enriched_jobs
+    
+    def save_jobs_to_db(self, jobs):
+        """Apply only the adds, changes and closures since the last run to the database"""
         try:
+            # Create the tables and bring an older schema up to date first
+            init_db()
+            changeset = diff_snapshots(load_state(self.session), jobs)
+            counts = apply_changeset(self.session, changeset)
             self.session.commit()
-            print(f"💾 Successfully saved {saved_count} new jobs to database")
-            if skipped_count > 0:
-                print(f"⏭️ Skipped {skipped_count} duplicate jobs")
+            print(f"💾 Added {counts['added']} new jobs, updated {counts['changed']}, closed {counts['closed']}")
+            if counts['unchanged'] > 0:
+                print(f"⏭️ Skipped {counts['unchanged']} unchanged jobs")
+            if counts['matches'] > 0:
+                print(f"🔔 {counts['matches']} new saved search matches")
         except Exception as e:
             self.session.rollback()
             print(f"❌ Error committing jobs to database: {e}")
@@ -280,7 +340,7 @@ class ActuaryListScraper:
         except Exception as e:
             print(f"❌ Error saving to JSON: {e}")
     
-    def run_scraper(self, max_jobs=100, save_to_db=True, save_to_json=True):
+    def run_scraper(self, max_jobs=100, save_to_db=True, save_to_json=True, enrich=True, enrich_workers=8, enrich_rate=4.0):
         """Run the complete scraping process"""
         print("🚀 Starting Actuary List scraper...")
         print(f"📋 Target: {max_jobs} jobs")
@@ -293,6 +353,13 @@ class ActuaryListScraper:
                 print("❌ No jobs found to process")
                 return 0
             
+            # Fetch detail pages
+            if enrich:
+                jobs = self.enrich_jobs(jobs, max_workers=enrich_workers, requests_per_second=enrich_rate)
+            else:
+                # Keep the placeholder description and listing-only tags from overwriting enriched rows
+                jobs = [self.drop_description_fields(job) for job in jobs]
+            
             # Save to database
             if save_to_db:
                 self.save_jobs_to_db(jobs)
@@ -321,6 +388,9 @@ def main():
     parser.add_argument('--no-headless', action='store_true', help='Run browser in visible mode')
     parser.add_argument('--no-db', action='store_true', help='Skip saving to database')
     parser.add_argument('--no-json', action='store_true', help='Skip saving to JSON file')
+    parser.add_argument('--no-enrich', action='store_true', help='Skip fetching job detail pages')
+    parser.add_argument('--enrich-workers', type=int, default=8, help='Concurrent detail page fetches')
+    parser.add_argument('--enrich-rate', type=float, default=4.0, help='Detail page requests per second per host')
     
     args = parser.parse_args()
     
@@ -328,7 +398,10 @@ def main():
     scraper.run_scraper(
         max_jobs=args.max_jobs,
         save_to_db=not args.no_db,
-        save_to_json=not args.no_json
+        save_to_json=not args.no_json,
+        enrich=not args.no_enrich,
+        enrich_workers=args.enrich_workers,
+        enrich_rate=args.enrich_rate
     )
 
 if __name__ == "__main__":
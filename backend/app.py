@@ -2,18 +2,28 @@ from flask import Flask
 from flask_cors import CORS
 from .routes.job_routes import job_bp
 from .routes.scraper_routes import scraper_bp
+from .routes.saved_search_routes import saved_search_bp
 from .db import init_db
 
-def create_app():
+def create_app(init_database=True):
+    """Build the Flask app.
+
+    The production server creates tables once in the master process, so
+    workers pass init_database=False to skip it, and nothing here touches
+    the database then. Each process builds its own typeahead index on the
+    first suggest request.
+    """
     app = Flask(__name__)
     CORS(app)
     
     # Initialize database
-    init_db()
+    if init_database:
+        init_db()
     
     # Register blueprints
     app.register_blueprint(job_bp, url_prefix='/api/jobs')
     app.register_blueprint(scraper_bp, url_prefix='/api')
+    app.register_blueprint(saved_search_bp, url_prefix='/api/saved-searches')
     return app
 
 if __name__ == '__main__':
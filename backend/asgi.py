@@ -0,0 +1,44 @@
+"""ASGI entry point serving the read endpoints asynchronously.
+
+GET /api/jobs, /api/jobs/<id>, /api/jobs/search and /api/scraper-jobs are
+answered on the event loop through SQLAlchemy's asyncio extension, so a
+request waiting on the database no longer holds a thread. Every other route
+is handed to the regular Flask app through a WSGI adapter, so the full API
+stays available. Start it with serve_async.py, or directly:
+
+    uvicorn backend.asgi:app --port 5000
+
+Tables are created and upgraded at startup, so a fresh database works
+either way.
+"""
+import contextlib
+import os
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Mount
+
+from .app import create_app
+from .async_db import async_engine
+from .db import init_db
+from .routes.async_read_routes import routes
+
+def create_asgi_app():
+    """Build the ASGI app; nothing touches the database until startup"""
+    flask_app = create_app(init_database=False)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        await run_in_threadpool(init_db)
+        yield
+        await async_engine.dispose()
+
+    return Starlette(
+        routes=routes + [
+            Mount('/', app=WSGIMiddleware(flask_app, workers=int(os.getenv('WSGI_THREADS', '10'))))
+        ],
+        lifespan=lifespan
+    )
+
+app = create_asgi_app()
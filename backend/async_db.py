@@ -0,0 +1,21 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from .db import DATABASE_URL, SQLALCHEMY_ECHO
+
+# Sync URL scheme -> asyncio driver for the same database
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+def async_database_url(url):
+    """Rewrite a sync DATABASE_URL to use an asyncio driver"""
+    scheme, rest = url.split('://', 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+# Create async engine
+async_engine = create_async_engine(async_database_url(DATABASE_URL), echo=SQLALCHEMY_ECHO)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
@@ -0,0 +1,71 @@
+"""Small HTTP load generator for comparing ways of serving the API.
+
+Start a server, then run from the repository root:
+
+    python -m backend.benchmark --url http://127.0.0.1:5000/api/jobs/ --concurrency 16 --duration 10
+
+Only the standard library is used so it runs anywhere the backend does.
+"""
+import argparse
+import threading
+import time
+import urllib.request
+from urllib.error import URLError
+
+def run_benchmark(url, concurrency=16, duration=10.0):
+    """Hit url from concurrency threads for duration seconds and return stats"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        local_latencies = []
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                local_latencies.append(time.perf_counter() - start)
+            except (URLError, OSError):
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        'requests': count,
+        'errors': errors[0],
+        'seconds': elapsed,
+        'requests_per_second': count / elapsed if elapsed else 0.0,
+        'p50_ms': latencies[count // 2] * 1000 if count else None,
+        'p99_ms': latencies[min(count - 1, int(count * 0.99))] * 1000 if count else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure API throughput')
+    parser.add_argument('--url', default='http://127.0.0.1:5000/api/jobs/', help='URL to request')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[16], help='Concurrent clients (several values run several rounds)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per round')
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for concurrency in args.concurrency:
+        stats = run_benchmark(args.url, concurrency, args.duration)
+        p50 = f"{stats['p50_ms']:.1f}" if stats['p50_ms'] is not None else '-'
+        p99 = f"{stats['p99_ms']:.1f}" if stats['p99_ms'] is not None else '-'
+        print(f"{concurrency:>8} {stats['requests_per_second']:>10.1f} {p50:>9} {p99:>9} {stats['errors']:>7}")
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,17 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from backend.models.job import Base
+from backend.models import saved_search  # registers the saved search tables on Base
+from backend.models import change_counter  # registers the change counter table and its session hook
 
 import os
 
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///job_listings.db')
+SQLALCHEMY_ECHO = os.getenv('SQLALCHEMY_ECHO', 'True').lower() == 'true'
 
 # Create engine
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(DATABASE_URL, echo=SQLALCHEMY_ECHO)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -16,6 +19,26 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 def init_db():
     """Initialize the database and create tables"""
     Base.metadata.create_all(bind=engine)
+    upgrade_db()
+
+def upgrade_db():
+    """Add columns and indexes that create_all() cannot add to an existing table"""
+    columns = {column['name'] for column in inspect(engine).get_columns('jobs')}
+    with engine.begin() as conn:
+        if 'status' not in columns:
+            conn.execute(text("ALTER TABLE jobs ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT 'open'"))
+        if 'content_hash' not in columns:
+            conn.execute(text("ALTER TABLE jobs ADD COLUMN content_hash VARCHAR(40)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_application_url ON jobs (application_url)"))
+
+def dispose_engine_after_fork():
+    """Drop pooled connections inherited from the parent process.
+
+    Call this in a freshly forked worker. The engine object is kept so the
+    session factories already bound to it stay valid; only the pool is
+    replaced, and close=False leaves the parent's connections untouched.
+    """
+    engine.dispose(close=False)
 
 def get_db():
     """Get database session"""
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, event, select
+from sqlalchemy.orm import Session
+
+from .job import Base, Job
+
+class ChangeCounter(Base):
+    """Version number per table, bumped once by every transaction that writes to it.
+
+    Processes that cache a table in memory compare it with the version their
+    cache reflects to tell whether anyone else has written since.
+    """
+    __tablename__ = 'change_counters'
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+def current_version(connection, name):
+    """Committed version of a counter; 0 if nothing has bumped it yet"""
+    version = connection.execute(
+        select(ChangeCounter.version).where(ChangeCounter.name == name)
+    ).scalar()
+    return version or 0
+
+def bump_version(connection, name):
+    """Increment a counter inside the caller's transaction and return the new version"""
+    table = ChangeCounter.__table__
+    result = connection.execute(
+        table.update().where(table.c.name == name).values(version=table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(name=name, version=1))
+        return 1
+    return current_version(connection, name)
+
+def _writes_jobs(session):
+    """Whether the flush just done inserted, deleted or changed a job"""
+    if any(isinstance(obj, Job) for obj in session.new) or any(isinstance(obj, Job) for obj in session.deleted):
+        return True
+    return any(isinstance(obj, Job) and session.is_modified(obj) for obj in session.dirty)
+
+@event.listens_for(Session, 'after_flush')
+def _count_job_writes(session, flush_context):
+    # Once per transaction; the version is left in session.info for after_commit listeners
+    if 'jobs_version' not in session.info and _writes_jobs(session):
+        session.info['jobs_version'] = bump_version(session.connection(), 'jobs')
+
+@event.listens_for(Session, 'after_transaction_end')
+def _transaction_ended(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('jobs_version', None)
@@ -19,8 +19,10 @@ class Job(Base):
     salary_max = Column(Float, nullable=True)
     experience_level = Column(String(50), nullable=True)  # entry, mid, senior, etc.
     skills_required = Column(Text, nullable=True)
-    application_url = Column(String(500), nullable=True)
+    application_url = Column(String(500), nullable=True, index=True)
     source = Column(String(100), nullable=True, default='manual')  # manual, scraped, etc.
+    status = Column(String(20), nullable=False, default='open')  # open, closed
+    content_hash = Column(String(40), nullable=True)  # set when ingested from a scraper snapshot
     
     def to_dict(self):
         return {
@@ -37,5 +39,6 @@ class Job(Base):
             'experience_level': self.experience_level,
             'skills_required': self.skills_required,
             'application_url': self.application_url,
-            'source': self.source
+            'source': self.source,
+            'status': self.status
         }
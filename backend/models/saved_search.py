@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+
+from .job import Base
+
+class SavedSearch(Base):
+    __tablename__ = 'saved_searches'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(200), nullable=False)
+    # Same filters as GET /api/jobs; empty means "any"
+    location = Column(String(200), nullable=True)
+    job_type = Column(String(50), nullable=True)
+    tag = Column(String(100), nullable=True)
+    search = Column(String(200), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'location': self.location,
+            'job_type': self.job_type,
+            'tag': self.tag,
+            'search': self.search,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class SavedSearchMatch(Base):
+    __tablename__ = 'saved_search_matches'
+    __table_args__ = (UniqueConstraint('saved_search_id', 'job_id'),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    saved_search_id = Column(Integer, ForeignKey('saved_searches.id', ondelete='CASCADE'), nullable=False, index=True)
+    job_id = Column(Integer, ForeignKey('jobs.id', ondelete='CASCADE'), nullable=False, index=True)
+    matched_at = Column(DateTime, default=datetime.utcnow)
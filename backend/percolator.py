@@ -0,0 +1,176 @@
+"""Match new jobs against saved searches by indexing the searches themselves.
+
+Running every saved search against the jobs table after each ingest costs
+O(searches x rows). Instead, each saved search is filed in a reverse index
+under one "anchor": a condition any matching job must satisfy and that can
+be looked up from the job's side. Substring filters (tag, search text,
+location) are anchored on a trigram of the filter value, since a job can
+only contain the value if it contains each of its trigrams; job_type is
+anchored on its exact value. A job then only has to be checked against the
+searches filed under its own trigrams and job_type, plus the few searches
+too short to anchor.
+"""
+import string
+
+from sqlalchemy import func
+
+from .models.saved_search import SavedSearch, SavedSearchMatch
+
+NGRAM = 3
+
+# SQLite's lower() and LIKE fold ASCII letters only ("É" and "é" differ), so
+# the matcher folds case the same way as the database it runs against
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def _fold(text):
+    return (text or '').translate(_ASCII_LOWER)
+
+def _trigrams(text):
+    """All distinct case-folded trigrams of text"""
+    text = _fold(text)
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+def _contains(haystack, needle):
+    """Literal case-insensitive substring test, as the escaped icontains() filters in queries.py do"""
+    return _fold(needle) in _fold(haystack)
+
+def _job_fields(job):
+    """The job attributes the filters look at, from a Job or a job dict"""
+    if isinstance(job, dict):
+        get = job.get
+    else:
+        def get(field):
+            return getattr(job, field, None)
+    return {field: get(field) for field in ['title', 'company', 'description', 'location', 'job_type', 'tags']}
+
+def search_matches_job(search, job):
+    """Whether a job passes a saved search, with the same rules as GET /api/jobs.
+
+    Filters are literal substrings, so '%' and '_' only match themselves,
+    and case is folded for ASCII letters only, as SQLite does.
+    """
+    fields = _job_fields(job)
+    if search.location and not _contains(fields['location'], search.location):
+        return False
+    if search.job_type and fields['job_type'] != search.job_type:
+        return False
+    if search.tag and not _contains(fields['tags'], search.tag):
+        return False
+    if search.search and not any(_contains(fields[field], search.search)
+                                 for field in ['title', 'company', 'description']):
+        return False
+    return True
+
+class SavedSearchIndex:
+    """Reverse index from job features to the saved searches they may satisfy"""
+
+    def __init__(self, searches):
+        self.by_anchor = {}
+        self.unanchored = []
+        for search in searches:
+            anchor = self._anchor(search)
+            if anchor is None:
+                self.unanchored.append(search)
+            else:
+                self.by_anchor.setdefault(anchor, []).append(search)
+
+    @staticmethod
+    def _anchor(search):
+        """Pick the (kind, value) key a saved search is filed under.
+
+        Substring filters are tried first because a trigram is far more
+        selective than one of a handful of job types.
+        """
+        for kind, value in [('tags', search.tag), ('text', search.search), ('location', search.location)]:
+            if value and len(value) >= NGRAM:
+                return (kind, _fold(value[:NGRAM]))
+        if search.job_type:
+            return ('job_type', search.job_type)
+        return None
+
+    def candidates(self, job):
+        """Saved searches that could match the job, without duplicates"""
+        fields = _job_fields(job)
+        keys = [('job_type', fields['job_type'])]
+        keys += [('tags', gram) for gram in _trigrams(fields['tags'])]
+        keys += [('location', gram) for gram in _trigrams(fields['location'])]
+        text_grams = set()
+        for field in ['title', 'company', 'description']:
+            text_grams |= _trigrams(fields[field])
+        keys += [('text', gram) for gram in text_grams]
+
+        seen = set()
+        result = []
+        for key in keys:
+            for search in self.by_anchor.get(key, ()):
+                if search.id not in seen:
+                    seen.add(search.id)
+                    result.append(search)
+        for search in self.unanchored:
+            if search.id not in seen:
+                seen.add(search.id)
+                result.append(search)
+        return result
+
+    def match(self, job):
+        """Saved searches the job satisfies"""
+        return [search for search in self.candidates(job) if search_matches_job(search, job)]
+
+class _DetachedSearch:
+    """Plain copy of a SavedSearch row so the cached index outlives its session"""
+
+    def __init__(self, row):
+        self.id = row.id
+        self.location = row.location
+        self.job_type = row.job_type
+        self.tag = row.tag
+        self.search = row.search
+
+_index = None
+_index_signature = None
+
+def get_index(session):
+    """Return the process-wide index, rebuilding it if saved searches changed.
+
+    Each worker process keeps its own copy, so changes made through another
+    worker are picked up by comparing a cheap count/max(updated_at) signature.
+    """
+    global _index, _index_signature
+    signature = tuple(session.query(
+        func.count(SavedSearch.id),
+        func.max(SavedSearch.id),
+        func.max(SavedSearch.updated_at)
+    ).one())
+    if _index is None or signature != _index_signature:
+        _index = SavedSearchIndex([_DetachedSearch(row) for row in session.query(SavedSearch).all()])
+        _index_signature = signature
+    return _index
+
+def percolate(session, jobs):
+    """Record a match row for every saved search each job satisfies.
+
+    The jobs must already have ids (flush first). Pairs that were matched
+    before are not recorded again. Returns the number of new matches; the
+    caller commits.
+    """
+    jobs = [job for job in jobs if job.id is not None]
+    if not jobs:
+        return 0
+    index = get_index(session)
+    if not index.by_anchor and not index.unanchored:
+        return 0
+
+    pairs = set()
+    for job in jobs:
+        for search in index.match(job):
+            pairs.add((search.id, job.id))
+    if not pairs:
+        return 0
+
+    existing = set(session.query(SavedSearchMatch.saved_search_id, SavedSearchMatch.job_id).filter(
+        SavedSearchMatch.job_id.in_({job_id for _, job_id in pairs})
+    ).all())
+    new_pairs = pairs - existing
+    for saved_search_id, job_id in new_pairs:
+        session.add(SavedSearchMatch(saved_search_id=saved_search_id, job_id=job_id))
+    return len(new_pairs)
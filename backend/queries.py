@@ -0,0 +1,110 @@
+"""Query building shared by the sync (Flask) and async (ASGI) read endpoints.
+
+Both serving modes build their statements here so filtering, sorting and
+pagination stay identical whichever one answers the request.
+"""
+from sqlalchemy import select, func, or_
+
+from .models.job import Job
+
+SORT_ORDERS = {
+    'posting_date_desc': Job.posting_date.desc(),
+    'posting_date_asc': Job.posting_date.asc(),
+    'title_asc': Job.title.asc(),
+    'title_desc': Job.title.desc(),
+    'company_asc': Job.company.asc(),
+    'company_desc': Job.company.desc(),
+}
+
+def parse_jobs_args(args):
+    """Read the GET /api/jobs query parameters from a request args mapping"""
+    return {
+        'page': int(args.get('page', 1)),
+        'per_page': int(args.get('per_page', 10)),
+        'location': args.get('location'),
+        'job_type': args.get('job_type'),
+        'tag': args.get('tag'),
+        'search': args.get('search'),
+        'status': args.get('status'),
+        'sort': args.get('sort', 'posting_date_desc'),
+    }
+
+def jobs_statement(location=None, job_type=None, tag=None, search=None, status=None, sort='posting_date_desc'):
+    """Filtered and sorted select of jobs, before pagination.
+
+    Text filters are literal case-insensitive substrings: '%' and '_' in a
+    value are escaped rather than treated as LIKE wildcards. Saved searches
+    are matched by the same rules (see percolator.search_matches_job).
+    """
+    stmt = select(Job)
+
+    # Apply filters
+    if location:
+        stmt = stmt.where(Job.location.icontains(location, autoescape=True))
+    if job_type:
+        stmt = stmt.where(Job.job_type == job_type)
+    if tag:
+        stmt = stmt.where(Job.tags.icontains(tag, autoescape=True))
+    if status:
+        stmt = stmt.where(Job.status == status)
+    if search:
+        stmt = stmt.where(
+            or_(
+                Job.title.icontains(search, autoescape=True),
+                Job.company.icontains(search, autoescape=True),
+                Job.description.icontains(search, autoescape=True)
+            )
+        )
+
+    # Unknown sort values fall back to newest first
+    return stmt.order_by(SORT_ORDERS.get(sort, SORT_ORDERS['posting_date_desc']))
+
+def count_statement(stmt):
+    """Row count of a select, ignoring its ordering"""
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+def page_statement(stmt, page, per_page):
+    """One page of a select"""
+    return stmt.offset((page - 1) * per_page).limit(per_page)
+
+def jobs_page_response(jobs, total, page, per_page):
+    """Response body of GET /api/jobs"""
+    return {
+        'jobs': [job.to_dict() for job in jobs],
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'total_pages': (total + per_page - 1) // per_page
+    }
+
+def search_statement(query_text):
+    """Jobs whose title, company, description or tags contain query_text"""
+    return select(Job).where(
+        or_(
+            Job.title.icontains(query_text, autoescape=True),
+            Job.company.icontains(query_text, autoescape=True),
+            Job.description.icontains(query_text, autoescape=True),
+            Job.tags.icontains(query_text, autoescape=True)
+        )
+    )
+
+def filter_scraped_jobs(jobs, location=None, job_type=None, search=None):
+    """Apply the GET /api/scraper-jobs filters to the scraped job dicts"""
+    filtered_jobs = jobs
+
+    if location:
+        filtered_jobs = [job for job in filtered_jobs
+                         if location.lower() in job.get('location', '').lower()]
+
+    if job_type:
+        filtered_jobs = [job for job in filtered_jobs
+                         if job.get('job_type') == job_type]
+
+    if search:
+        search_lower = search.lower()
+        filtered_jobs = [job for job in filtered_jobs
+                         if (search_lower in job.get('title', '').lower() or
+                             search_lower in job.get('company', '').lower() or
+                             search_lower in job.get('description', '').lower())]
+
+    return filtered_jobs
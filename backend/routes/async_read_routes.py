@@ -0,0 +1,99 @@
+import json
+import os
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from ..models.job import Job
+from ..async_db import AsyncSessionLocal
+from ..queries import parse_jobs_args, jobs_statement, count_statement, page_statement, jobs_page_response, search_statement, filter_scraped_jobs
+from . import scraper_routes
+
+class FlaskJSONResponse(JSONResponse):
+    """JSON encoded the way Flask's jsonify does it, with the CORS header Flask-CORS adds"""
+
+    def render(self, content):
+        return json.dumps(content, sort_keys=True).encode('utf-8')
+
+    def init_headers(self, headers=None):
+        super().init_headers(headers)
+        self.raw_headers.append((b'access-control-allow-origin', b'*'))
+
+async def get_jobs(request):
+    """Get all jobs with optional filtering and sorting"""
+    try:
+        # Get query parameters
+        args = parse_jobs_args(request.query_params)
+        page = args.pop('page')
+        per_page = args.pop('per_page')
+        
+        # Build filtered, sorted query
+        stmt = jobs_statement(**args)
+        
+        # Pagination
+        async with AsyncSessionLocal() as session:
+            total = (await session.execute(count_statement(stmt))).scalar_one()
+            jobs = (await session.execute(page_statement(stmt, page, per_page))).scalars().all()
+        
+        return FlaskJSONResponse(jobs_page_response(jobs, total, page, per_page))
+    except Exception as e:
+        return FlaskJSONResponse({'error': str(e)}, status_code=500)
+
+async def get_job(request):
+    """Get a specific job by ID"""
+    try:
+        async with AsyncSessionLocal() as session:
+            job = await session.get(Job, request.path_params['job_id'])
+        if not job:
+            return FlaskJSONResponse({'error': 'Job not found'}, status_code=404)
+        return FlaskJSONResponse(job.to_dict())
+    except Exception as e:
+        return FlaskJSONResponse({'error': str(e)}, status_code=500)
+
+async def search_jobs(request):
+    """Search jobs by title, company, or description"""
+    try:
+        query_text = request.query_params.get('q', '')
+        if not query_text:
+            return FlaskJSONResponse({'error': 'Search query is required'}, status_code=400)
+        
+        async with AsyncSessionLocal() as session:
+            jobs = (await session.execute(search_statement(query_text))).scalars().all()
+        
+        return FlaskJSONResponse({'jobs': [job.to_dict() for job in jobs]})
+    except Exception as e:
+        return FlaskJSONResponse({'error': str(e)}, status_code=500)
+
+def _read_scraped_jobs(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+async def get_scraped_jobs(request):
+    """Return jobs from the scraped_jobs.json file with optional filtering"""
+    try:
+        # File I/O and parsing run off the event loop
+        jobs = await run_in_threadpool(_read_scraped_jobs, scraper_routes.SCRAPER_JSON_PATH)
+        if jobs is None:
+            return FlaskJSONResponse({'error': 'Scraped jobs file not found'}, status_code=404)
+        
+        # Apply filters if provided
+        filtered_jobs = filter_scraped_jobs(
+            jobs,
+            location=request.query_params.get('location'),
+            job_type=request.query_params.get('job_type'),
+            search=request.query_params.get('search')
+        )
+        
+        return FlaskJSONResponse({'jobs': filtered_jobs, 'total': len(filtered_jobs)})
+    except Exception as e:
+        return FlaskJSONResponse({'error': str(e)}, status_code=500)
+
+# Read endpoints served natively on the event loop; everything else falls through to Flask
+routes = [
+    Route('/api/jobs', get_jobs, methods=['GET']),
+    Route('/api/jobs/', get_jobs, methods=['GET']),
+    Route('/api/jobs/search', search_jobs, methods=['GET']),
+    Route('/api/jobs/{job_id:int}', get_job, methods=['GET']),
+    Route('/api/scraper-jobs', get_scraped_jobs, methods=['GET']),
+]
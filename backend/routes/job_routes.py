@@ -2,7 +2,11 @@ from flask import Blueprint, request, jsonify
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import or_, and_
 from ..models.job import Job
+from ..models.saved_search import SavedSearchMatch
 from ..db import engine
+from ..percolator import percolate
+from ..suggest import suggestion_index, MAX_LIMIT
+from ..queries import parse_jobs_args, jobs_statement, count_statement, page_statement, jobs_page_response, search_statement
 import json
 from datetime import datetime
 
@@ -15,61 +19,18 @@ def get_jobs():
     session = Session()
     try:
         # Get query parameters
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 10))
-        location = request.args.get('location')
-        job_type = request.args.get('job_type')
-        tag = request.args.get('tag')
-        search = request.args.get('search')
-        sort = request.args.get('sort', 'posting_date_desc')
-        
-        # Build query
-        query = session.query(Job)
-        
-        # Apply filters
-        if location:
-            query = query.filter(Job.location.ilike(f'%{location}%'))
-        if job_type:
-            query = query.filter(Job.job_type == job_type)
-        if tag:
-            query = query.filter(Job.tags.ilike(f'%{tag}%'))
-        if search:
-            query = query.filter(
-                or_(
-                    Job.title.ilike(f'%{search}%'),
-                    Job.company.ilike(f'%{search}%'),
-                    Job.description.ilike(f'%{search}%')
-                )
-            )
-        
-        # Apply sorting
-        if sort == 'posting_date_desc':
-            query = query.order_by(Job.posting_date.desc())
-        elif sort == 'posting_date_asc':
-            query = query.order_by(Job.posting_date.asc())
-        elif sort == 'title_asc':
-            query = query.order_by(Job.title.asc())
-        elif sort == 'title_desc':
-            query = query.order_by(Job.title.desc())
-        elif sort == 'company_asc':
-            query = query.order_by(Job.company.asc())
-        elif sort == 'company_desc':
-            query = query.order_by(Job.company.desc())
-        else:
-            # Default sorting
-            query = query.order_by(Job.posting_date.desc())
+        args = parse_jobs_args(request.args)
+        page = args.pop('page')
+        per_page = args.pop('per_page')
+        
+        # Build filtered, sorted query
+        stmt = jobs_statement(**args)
         
         # Pagination
-        total = query.count()
-        jobs = query.offset((page - 1) * per_page).limit(per_page).all()
+        total = session.execute(count_statement(stmt)).scalar_one()
+        jobs = session.execute(page_statement(stmt, page, per_page)).scalars().all()
         
-        return jsonify({
-            'jobs': [job.to_dict() for job in jobs],
-            'total': total,
-            'page': page,
-            'per_page': per_page,
-            'total_pages': (total + per_page - 1) // per_page
-        })
+        return jsonify(jobs_page_response(jobs, total, page, per_page))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
@@ -119,6 +80,8 @@ def create_job():
         )
         
         session.add(job)
+        session.flush()
+        percolate(session, [job])
         session.commit()
         
         return jsonify(job.to_dict()), 201
@@ -146,6 +109,7 @@ def update_job(job_id):
             if field in data:
                 setattr(job, field, data[field])
         
+        percolate(session, [job])
         session.commit()
         return jsonify(job.to_dict())
     except Exception as e:
@@ -163,6 +127,7 @@ def delete_job(job_id):
         if not job:
             return jsonify({'error': 'Job not found'}), 404
         
+        session.query(SavedSearchMatch).filter(SavedSearchMatch.job_id == job_id).delete()
         session.delete(job)
         session.commit()
         
@@ -182,17 +147,29 @@ def search_jobs():
         if not query_text:
             return jsonify({'error': 'Search query is required'}), 400
         
-        jobs = session.query(Job).filter(
-            or_(
-                Job.title.ilike(f'%{query_text}%'),
-                Job.company.ilike(f'%{query_text}%'),
-                Job.description.ilike(f'%{query_text}%'),
-                Job.tags.ilike(f'%{query_text}%')
-            )
-        ).all()
+        jobs = session.execute(search_statement(query_text)).scalars().all()
         
         return jsonify({'jobs': [job.to_dict() for job in jobs]})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
         session.close()
+
+@job_bp.route('/suggest', methods=['GET'])
+def suggest_jobs():
+    """Typeahead completions across company, title, location and tag values"""
+    try:
+        prefix = request.args.get('prefix', '').strip()
+        if not prefix:
+            return jsonify({'error': 'prefix is required'}), 400
+        limit = min(int(request.args.get('limit', 10)), MAX_LIMIT)
+        
+        # Builds the index on first use, then picks up writes made by other processes
+        suggestion_index.refresh_if_stale(Session)
+        
+        return jsonify({
+            'prefix': prefix,
+            'suggestions': suggestion_index.suggest(prefix, limit)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
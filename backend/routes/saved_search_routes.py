@@ -0,0 +1,126 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy.orm import sessionmaker
+from ..models.job import Job
+from ..models.saved_search import SavedSearch, SavedSearchMatch
+from ..db import engine
+
+saved_search_bp = Blueprint('saved_searches', __name__)
+Session = sessionmaker(bind=engine)
+
+FILTER_FIELDS = ['location', 'job_type', 'tag', 'search']
+
+@saved_search_bp.route('/', methods=['GET'], strict_slashes=False)
+def get_saved_searches():
+    """List all saved searches"""
+    session = Session()
+    try:
+        searches = session.query(SavedSearch).order_by(SavedSearch.id.asc()).all()
+        return jsonify({'saved_searches': [search.to_dict() for search in searches]})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+@saved_search_bp.route('/', methods=['POST'], strict_slashes=False)
+def create_saved_search():
+    """Save a search; jobs ingested from now on are matched against it"""
+    session = Session()
+    try:
+        data = request.get_json() or {}
+
+        if not data.get('name'):
+            return jsonify({'error': 'name is required'}), 400
+        if not any(data.get(field) for field in FILTER_FIELDS):
+            return jsonify({'error': f"at least one of {', '.join(FILTER_FIELDS)} is required"}), 400
+
+        search = SavedSearch(
+            name=data['name'],
+            location=data.get('location') or None,
+            job_type=data.get('job_type') or None,
+            tag=data.get('tag') or None,
+            search=data.get('search') or None
+        )
+
+        session.add(search)
+        session.commit()
+
+        return jsonify(search.to_dict()), 201
+    except Exception as e:
+        session.rollback()
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+@saved_search_bp.route('/<int:search_id>', methods=['GET'])
+def get_saved_search(search_id):
+    """Get a specific saved search by ID"""
+    session = Session()
+    try:
+        search = session.query(SavedSearch).filter(SavedSearch.id == search_id).first()
+        if not search:
+            return jsonify({'error': 'Saved search not found'}), 404
+        return jsonify(search.to_dict())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+@saved_search_bp.route('/<int:search_id>', methods=['DELETE'])
+def delete_saved_search(search_id):
+    """Delete a saved search and its recorded matches"""
+    session = Session()
+    try:
+        search = session.query(SavedSearch).filter(SavedSearch.id == search_id).first()
+        if not search:
+            return jsonify({'error': 'Saved search not found'}), 404
+
+        session.query(SavedSearchMatch).filter(SavedSearchMatch.saved_search_id == search_id).delete()
+        session.delete(search)
+        session.commit()
+
+        return jsonify({'message': 'Saved search deleted successfully'})
+    except Exception as e:
+        session.rollback()
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+@saved_search_bp.route('/<int:search_id>/matches', methods=['GET'])
+def get_saved_search_matches(search_id):
+    """Jobs matched by a saved search, newest match first"""
+    session = Session()
+    try:
+        search = session.query(SavedSearch).filter(SavedSearch.id == search_id).first()
+        if not search:
+            return jsonify({'error': 'Saved search not found'}), 404
+
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 10))
+
+        query = session.query(Job, SavedSearchMatch.matched_at).join(
+            SavedSearchMatch, SavedSearchMatch.job_id == Job.id
+        ).filter(
+            SavedSearchMatch.saved_search_id == search_id
+        ).order_by(SavedSearchMatch.matched_at.desc(), SavedSearchMatch.id.desc())
+
+        total = query.count()
+        rows = query.offset((page - 1) * per_page).limit(per_page).all()
+
+        jobs = []
+        for job, matched_at in rows:
+            job_dict = job.to_dict()
+            job_dict['matched_at'] = matched_at.isoformat() if matched_at else None
+            jobs.append(job_dict)
+
+        return jsonify({
+            'saved_search': search.to_dict(),
+            'jobs': jobs,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'total_pages': (total + per_page - 1) // per_page
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
@@ -0,0 +1,39 @@
+"""Run the API in async mode under uvicorn.
+
+From the repository root:
+
+    python -m backend.serve_async
+
+Settings come from the environment:
+
+    UVICORN_HOST      address to listen on (default 0.0.0.0)
+    UVICORN_PORT      port (default 5000)
+    UVICORN_WORKERS   worker processes (default 1)
+    WSGI_THREADS      threads for the routes still served by Flask (default 10)
+
+Tables are created here, once, before any worker starts, so several
+workers never race to create them. Each worker's startup then finds them
+in place.
+"""
+import os
+
+# Per-query SQL logging costs far more than the queries themselves
+os.environ.setdefault('SQLALCHEMY_ECHO', 'False')
+
+import uvicorn
+
+from .db import init_db, engine
+
+def main():
+    init_db()
+    engine.dispose()
+    uvicorn.run(
+        'backend.asgi:app',
+        host=os.getenv('UVICORN_HOST', '0.0.0.0'),
+        port=int(os.getenv('UVICORN_PORT', '5000')),
+        workers=int(os.getenv('UVICORN_WORKERS', '1')),
+        log_level='warning'
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Diff successive scraper snapshots and apply only the changes to the database.
+
+A snapshot is the list of job dicts the scraper writes to scraped_jobs.json.
+Each job is identified by a stable key and fingerprinted by a content hash.
+The hash is stored on the job row when it is ingested, so the key -> hash
+map of what was last applied always describes the database it lives in.
+Comparing a new snapshot against that map yields a changeset of added,
+changed and removed jobs, so ingest only touches rows that actually churned.
+"""
+import hashlib
+import json
+from datetime import datetime
+
+from sqlalchemy import or_
+
+from .models.job import Job
+from .percolator import percolate
+
+# Fields that make up a job's content. posting_date is left out on purpose:
+# the scraper derives it from relative text like "2 days ago", so it drifts
+# between runs without the posting itself changing.
+CONTENT_FIELDS = [
+    'title', 'company', 'location', 'job_type', 'tags', 'description',
+    'salary_min', 'salary_max', 'experience_level', 'skills_required',
+    'application_url', 'source'
+]
+
+def job_key(job):
+    """Stable identity for a scraped job: ('url', url), else ('company_title', company, title)"""
+    if job.get('application_url'):
+        return ('url', job['application_url'])
+    return ('company_title', job.get('company', ''), job.get('title', ''))
+
+def content_hash(job):
+    """Fingerprint of a job's content fields"""
+    content = {field: job.get(field) for field in CONTENT_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+def load_state(session):
+    """Key -> hash map of the open jobs that were ingested from a snapshot"""
+    rows = session.query(Job.application_url, Job.company, Job.title, Job.content_hash).filter(
+        Job.content_hash.isnot(None),
+        Job.status == 'open'
+    )
+    return {
+        job_key({'application_url': url, 'company': company, 'title': title}): digest
+        for url, company, title, digest in rows
+    }
+
+def diff_snapshots(previous_state, jobs):
+    """Compare a new snapshot against the previous key -> hash map.
+
+    Returns a changeset dict with 'added' and 'changed' job dicts, 'removed'
+    keys, the 'unchanged' count and the new key -> hash 'state' map.
+    """
+    added = []
+    changed = []
+    unchanged = 0
+    state = {}
+
+    for job in jobs:
+        key = job_key(job)
+        if key in state:
+            # Duplicate within the same snapshot, keep the first
+            continue
+        digest = content_hash(job)
+        state[key] = digest
+
+        previous = previous_state.get(key)
+        if previous is None:
+            added.append(job)
+        elif previous != digest:
+            changed.append(job)
+        else:
+            unchanged += 1
+
+    removed = [key for key in previous_state if key not in state]
+
+    return {
+        'added': added,
+        'changed': changed,
+        'removed': removed,
+        'unchanged': unchanged,
+        'state': state
+    }
+
+def _parse_posting_date(value):
+    """Accept the datetime or ISO string forms the scraper produces"""
+    if isinstance(value, datetime):
+        return value
+    if value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    return datetime.now()
+
+def _key_filter(keys):
+    """SQL filter matching jobs by the keys job_key() produces"""
+    urls = [key[1] for key in keys if key[0] == 'url']
+    conditions = []
+    if urls:
+        conditions.append(Job.application_url.in_(urls))
+    for key in keys:
+        if key[0] == 'company_title':
+            _, company, title = key
+            # '' as well, since job_key() treats an empty URL as missing
+            conditions.append((Job.company == company) & (Job.title == title) &
+                              (or_(Job.application_url.is_(None), Job.application_url == '')))
+    return or_(*conditions)
+
+def _find_jobs(session, keys):
+    """Fetch existing rows for the given keys in one query, keyed by job_key()"""
+    if not keys:
+        return {}
+    rows = session.query(Job).filter(_key_filter(keys)).all()
+    return {job_key(row.to_dict()): row for row in rows}
+
+def apply_changeset(session, changeset):
+    """Apply a changeset to the database and return per-kind counts.
+
+    Added and changed jobs are upserted by key, which also reopens a job that
+    was closed and later reappears. Removed jobs are marked closed rather than
+    deleted. Each upserted row stores its content hash, which is what
+    load_state() reads back, so the state is committed in the same
+    transaction as the rows. Upserted jobs are matched against saved
+    searches. The caller commits.
+    """
+    upserts = changeset['added'] + changeset['changed']
+    existing = _find_jobs(session, [job_key(job) for job in upserts])
+
+    added_count = 0
+    changed_count = 0
+    upserted = []
+    for job_data in upserts:
+        job = existing.get(job_key(job_data))
+        if job is None:
+            job = Job(
+                title=job_data.get('title', ''),
+                company=job_data.get('company', ''),
+                location=job_data.get('location', ''),
+                job_type=job_data.get('job_type', 'full-time'),
+                source=job_data.get('source', 'scraper'),
+                posting_date=_parse_posting_date(job_data.get('posting_date'))
+            )
+            session.add(job)
+            added_count += 1
+        else:
+            changed_count += 1
+
+        for field in CONTENT_FIELDS:
+            if field in job_data:
+                setattr(job, field, job_data[field])
+        job.status = 'open'
+        job.content_hash = changeset['state'][job_key(job_data)]
+        upserted.append(job)
+
+    session.flush()
+    match_count = percolate(session, upserted)
+
+    closed_count = 0
+    if changeset['removed']:
+        closed_count = session.query(Job).filter(
+            _key_filter(changeset['removed']),
+            Job.status != 'closed'
+        ).update({Job.status: 'closed'}, synchronize_session=False)
+
+    return {
+        'added': added_count,
+        'changed': changed_count,
+        'closed': closed_count,
+        'unchanged': changeset['unchanged'],
+        'matches': match_count
+    }
@@ -0,0 +1,366 @@
+"""In-memory typeahead over job companies, titles, locations and tags.
+
+Every distinct (value, field) pair is kept with the number of jobs using it,
+in an array sorted by lowercased value, so all completions of a prefix sit
+in one contiguous slice found by binary search. Short prefixes cover huge
+slices, so their top-k lists are precomputed and cached; longer prefixes
+cover few enough entries to rank on the fly. The cache only holds prefixes
+whose slice is too big to scan, and is capped, so memory stays bounded.
+
+The index is built from the database on first use and kept current by ORM events: job
+inserts, updates and deletes are queued on the session and applied when it
+commits. Every transaction that writes jobs also bumps the 'jobs' change
+counter, and the index tracks the version its contents reflect, so its own
+commits advance that version as they are applied. Only a version it has
+not seen, i.e. a commit by another worker or the scraper, makes it stale;
+that is checked at most once every SUGGEST_REFRESH_SECONDS, and a stale
+index is rebuilt in a background thread and swapped in while requests keep
+using the old one. Local commits made during a rebuild are logged and
+replayed onto the new contents unless the rebuild already read them.
+"""
+import bisect
+import heapq
+import os
+import re
+import threading
+import time
+
+from sqlalchemy import event, inspect, func, select
+from sqlalchemy.orm import Session, object_session
+
+from .models.job import Job
+from .models.change_counter import ChangeCounter, current_version
+
+FIELDS = ['company', 'title', 'location', 'tags']
+
+# Largest limit a caller may ask for, and the length of each cached list
+MAX_LIMIT = 20
+# Slices up to this size are ranked per request instead of cached
+SCAN_LIMIT = 256
+# Upper bound on cached prefixes
+MAX_CACHED_PREFIXES = 100000
+# Seconds between checks for writes made by other processes
+REFRESH_SECONDS = float(os.getenv('SUGGEST_REFRESH_SECONDS', '5'))
+# Local commits kept for replay while waiting on a rebuild
+MAX_LOGGED_COMMITS = 10000
+
+def _location_values(location):
+    """Scraped locations hold several lines ("🇺🇸 USA\\n💰 $134k-$254k\\nBoston MA");
+    keep each place line without its leading emoji and skip salary lines"""
+    values = []
+    for line in (location or '').splitlines():
+        line = re.sub(r'^\W+', '', line.strip())
+        if line and '$' not in line:
+            values.append(line)
+    return values
+
+def job_values(job):
+    """(field, value) pairs a job contributes, from a Job or a job dict"""
+    if isinstance(job, dict):
+        get = job.get
+    else:
+        def get(field):
+            return getattr(job, field, None)
+    values = []
+    for field in ['company', 'title']:
+        value = (get(field) or '').strip()
+        if value:
+            values.append((field, value))
+    values += [('location', value) for value in _location_values(get('location'))]
+    values += [('tag', tag.strip()) for tag in (get('tags') or '').split(',') if tag.strip()]
+    return values
+
+def _slice(keys, prefix):
+    """Bounds of the keys starting with prefix in a sorted key list"""
+    lo = bisect.bisect_left(keys, (prefix,))
+    hi = bisect.bisect_left(keys, (prefix + '\U0010ffff',))
+    return lo, hi
+
+def _build_contents(jobs):
+    """Counts, sorted keys and warmed top lists for the values of the given jobs"""
+    counts = {}
+    for job in jobs:
+        for field, value in job_values(job):
+            key = (value.lower(), field)
+            entry = counts.get(key)
+            if entry is None:
+                counts[key] = [value, 1]
+            else:
+                entry[1] += 1
+
+    keys = sorted(counts)
+
+    def rank(key):
+        return (-counts[key][1], key)
+
+    # Warm the one- and two-character prefixes, which cover the widest slices
+    top = {}
+    for prefix in sorted({key[0][:length] for key in keys for length in (1, 2)}):
+        if len(top) >= MAX_CACHED_PREFIXES:
+            break
+        lo, hi = _slice(keys, prefix)
+        if hi - lo > SCAN_LIMIT:
+            top[prefix] = heapq.nsmallest(MAX_LIMIT, keys[lo:hi], key=rank)
+    return counts, keys, top
+
+class SuggestionIndex:
+    """Frequency-ranked prefix completions over a sorted array"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._counts = {}   # (lowercase value, field) -> [display value, job count]
+        self._keys = []     # sorted keys of _counts
+        self._top = {}      # prefix -> best MAX_LIMIT keys, best first
+        self.ready = False
+        self.version = 0        # 'jobs' change counter the contents reflect
+        self._log = {}          # version -> changes of local commits, for catching up and replay
+        self._building = False
+        self._refreshing = False
+        self._next_check = 0.0
+
+    def _rank(self, key):
+        return (-self._counts[key][1], key)
+
+    def _range(self, prefix):
+        return _slice(self._keys, prefix)
+
+    def _compute_top(self, prefix):
+        lo, hi = self._range(prefix)
+        return heapq.nsmallest(MAX_LIMIT, self._keys[lo:hi], key=self._rank), hi - lo
+
+    def begin_build(self):
+        """Start logging local commits so they can be replayed onto the new contents"""
+        with self._lock:
+            self._building = True
+
+    def cancel_build(self):
+        """Stop logging for a build that failed; the current contents stay"""
+        with self._lock:
+            self._building = False
+            self._catch_up()
+
+    def install(self, contents, version):
+        """Swap in contents read at the given version, then replay later local commits"""
+        counts, keys, top = contents
+        with self._lock:
+            self._counts = counts
+            self._keys = keys
+            self._top = top
+            self.version = version
+            self.ready = True
+            self._building = False
+            self._catch_up()
+
+    def build(self, jobs, version=0):
+        """Replace the index contents with the values of the given jobs.
+
+        Everything is computed before taking the lock, so a rebuild does not
+        hold up queries against the current contents.
+        """
+        self.begin_build()
+        try:
+            contents = _build_contents(jobs)
+        except Exception:
+            self.cancel_build()
+            raise
+        self.install(contents, version)
+
+    def _adjust(self, field, value, delta):
+        key = (value.lower(), field)
+        entry = self._counts.get(key)
+        if entry is None:
+            if delta < 0:
+                return
+            entry = self._counts[key] = [value, 0]
+            bisect.insort(self._keys, key)
+        entry[1] += delta
+        if delta > 0:
+            entry[0] = value
+
+        prefixes = [key[0][:length] for length in range(1, len(key[0]) + 1)]
+        if entry[1] <= 0:
+            del self._counts[key]
+            del self._keys[bisect.bisect_left(self._keys, key)]
+            for prefix in prefixes:
+                top = self._top.get(prefix)
+                if top is not None and key in top:
+                    del self._top[prefix]
+            return
+
+        for prefix in prefixes:
+            top = self._top.get(prefix)
+            if top is None:
+                continue
+            if delta < 0:
+                # Something below the cut may now outrank it; recompute on demand
+                if key in top:
+                    del self._top[prefix]
+                continue
+            if key in top:
+                top.sort(key=self._rank)
+            elif len(top) < MAX_LIMIT or self._rank(key) < self._rank(top[-1]):
+                top.append(key)
+                top.sort(key=self._rank)
+                del top[MAX_LIMIT:]
+
+    def _catch_up(self):
+        """Apply logged commits that directly follow the current version (lock held)"""
+        if not self.ready:
+            return
+        while self.version + 1 in self._log:
+            self.version += 1
+            for delta, values in self._log[self.version]:
+                for field, value in values:
+                    self._adjust(field, value, delta)
+        if not self._building:
+            # Older entries are already in the contents. Newer ones wait on a
+            # commit made elsewhere, which only a rebuild can bring in.
+            for version in [version for version in self._log if version <= self.version]:
+                del self._log[version]
+
+    def apply(self, changes, version):
+        """Apply the queued (delta, values) changes of a local commit that moved the counter to version.
+
+        A commit the contents already include (a rebuild read it) is skipped,
+        and one that does not follow on directly waits in the log.
+        """
+        with self._lock:
+            if not self.ready and not self._building:
+                return
+            if len(self._log) >= MAX_LOGGED_COMMITS:
+                # The next rebuild catches up instead
+                self._log.clear()
+            self._log[version] = changes
+            self._catch_up()
+
+    def refresh_if_stale(self, session_factory):
+        """Bring the index up to date with the jobs table.
+
+        The first call builds it and blocks until that is done. Later calls
+        return at once, starting a background rebuild if another process has
+        written jobs since the last build. Checks run at most every
+        REFRESH_SECONDS and only one check or rebuild runs at a time.
+        """
+        if not self.ready:
+            with self._build_lock:
+                if not self.ready:
+                    session = session_factory()
+                    try:
+                        build_suggestion_index(session, self)
+                    finally:
+                        session.close()
+            return
+        with self._lock:
+            if not self.ready or self._refreshing or time.monotonic() < self._next_check:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, args=(session_factory,), daemon=True).start()
+
+    def _refresh(self, session_factory):
+        session = session_factory()
+        try:
+            if current_version(session.connection(), 'jobs') != self.version:
+                build_suggestion_index(session, self)
+        except Exception:
+            # Keep serving the current contents; the next check tries again
+            pass
+        finally:
+            session.close()
+            with self._lock:
+                self._refreshing = False
+                self._next_check = time.monotonic() + REFRESH_SECONDS
+
+    def suggest(self, prefix, limit=10):
+        """Top completions of prefix as dicts, most frequent first"""
+        prefix = prefix.strip().lower()
+        limit = max(1, min(limit, MAX_LIMIT))
+        if not prefix:
+            return []
+        with self._lock:
+            top = self._top.get(prefix)
+            if top is None:
+                lo, hi = self._range(prefix)
+                if hi - lo > SCAN_LIMIT:
+                    top, _ = self._compute_top(prefix)
+                    if len(self._top) < MAX_CACHED_PREFIXES:
+                        self._top[prefix] = top
+                else:
+                    top = heapq.nsmallest(limit, self._keys[lo:hi], key=self._rank)
+            return [
+                {'value': self._counts[key][0], 'field': key[1], 'count': self._counts[key][1]}
+                for key in top[:limit]
+            ]
+
+suggestion_index = SuggestionIndex()
+
+def build_suggestion_index(session, index=suggestion_index):
+    """Fill the index (the process-wide one by default) from the jobs table"""
+    index.begin_build()
+    try:
+        # Used only if there are no rows to carry the version
+        snapshot = {'version': current_version(session.connection(), 'jobs')}
+        version_column = func.coalesce(
+            select(ChangeCounter.version).where(ChangeCounter.name == 'jobs').scalar_subquery(), 0
+        ).label('jobs_version')
+        rows = session.query(Job.company, Job.title, Job.location, Job.tags, version_column).yield_per(10000)
+
+        def jobs():
+            for row in rows:
+                # Read by the same statement as the rows, so it is the version they reflect
+                snapshot['version'] = row.jobs_version
+                yield row
+
+        contents = _build_contents(jobs())
+    except Exception:
+        index.cancel_build()
+        raise
+    index.install(contents, snapshot['version'])
+
+def _queue(target, *changes):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('suggestion_changes', []).extend(changes)
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    pass
+
+# An attribute expired by a commit has no old value in its history when it is
+# set again; active_history loads it first, so _job_updated can take it back out
+for _field in FIELDS:
+    event.listen(getattr(Job, _field), 'set', _keep_old_value, active_history=True)
+
+@event.listens_for(Job, 'after_insert')
+def _job_inserted(mapper, connection, target):
+    _queue(target, (1, job_values(target)))
+
+@event.listens_for(Job, 'after_update')
+def _job_updated(mapper, connection, target):
+    state = inspect(target)
+    old = {}
+    changed = False
+    for field in FIELDS:
+        history = state.attrs[field].history
+        if history.deleted:
+            old[field] = history.deleted[0]
+            changed = True
+        else:
+            old[field] = getattr(target, field)
+    if changed:
+        _queue(target, (-1, job_values(old)), (1, job_values(target)))
+
+@event.listens_for(Job, 'after_delete')
+def _job_deleted(mapper, connection, target):
+    _queue(target, (-1, job_values(target)))
+
+@event.listens_for(Session, 'after_commit')
+def _session_committed(session):
+    changes = session.info.pop('suggestion_changes', None)
+    # Set by the change counter hook whenever the transaction wrote jobs
+    version = session.info.get('jobs_version')
+    if version is not None:
+        suggestion_index.apply(changes or [], version)
+
+@event.listens_for(Session, 'after_rollback')
+def _session_rolled_back(session):
+    session.info.pop('suggestion_changes', None)
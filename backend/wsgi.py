@@ -0,0 +1,11 @@
+"""WSGI entry point for the production server.
+
+Run from the repository root:
+
+    gunicorn -c backend/gunicorn.conf.py backend.wsgi:app
+
+Tables are created by the gunicorn master (see gunicorn.conf.py), not here.
+"""
+from .app import create_app
+
+app = create_app(init_database=False)
@@ -0,0 +1,136 @@
+"""Detail page enrichment against a local fixture server."""
+import json
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Scraper'))
+from enrich import DetailPageEnricher, parse_detail_page
+
+NEXT_DATA = {
+    'props': {'pageProps': {'job': {
+        'title': 'Pricing Actuary',
+        'description': '<p>We need 4+ years of experience.</p><p>Python and SQL required. Pay $110k-$130k.</p>'
+    }}}
+}
+
+PAGES = {
+    '/next': (
+        '<html><body><h1>Pricing Actuary</h1>'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(NEXT_DATA)}</script>'
+        '<aside>Related job $10k-$20k</aside></body></html>'
+    ),
+    '/plain': (
+        '<html><body><div class="Job_description__x">Senior role using R and Excel. Salary $150k - $170k.</div></body></html>'
+    ),
+}
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves PAGES with a fixed ETag, answering 304 when it is sent back"""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.path == '/error':
+            self.send_response(500)
+            self.end_headers()
+            return
+        if self.path not in PAGES:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = PAGES[self.path].encode('utf-8')
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def fixture_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+def make_enricher(tmp_path, **kwargs):
+    kwargs.setdefault('requests_per_second', 0)
+    return DetailPageEnricher(cache_dir=str(tmp_path / 'cache'), **kwargs)
+
+def test_next_data_description_is_parsed(fixture_server, tmp_path):
+    server, base = fixture_server
+    job = {'title': 'Pricing Actuary', 'company': 'C', 'location': 'USA', 'application_url': f'{base}/next'}
+
+    enriched = make_enricher(tmp_path).enrich_job(job)
+
+    assert enriched['description'] == 'We need 4+ years of experience.\nPython and SQL required. Pay $110k-$130k.'
+    assert enriched['skills_required'] == 'Python, SQL'
+    assert enriched['experience_level'] == 'mid'
+    # The sidebar range is ignored; only the description is searched
+    assert (enriched['salary_min'], enriched['salary_max']) == (110000.0, 130000.0)
+
+def test_listing_salary_takes_precedence(fixture_server, tmp_path):
+    server, base = fixture_server
+    job = {'title': 'Actuary', 'company': 'C', 'location': '🇺🇸 USA\n💰 $134k-$254k', 'application_url': f'{base}/plain'}
+
+    enriched = make_enricher(tmp_path).enrich_job(job)
+
+    assert (enriched['salary_min'], enriched['salary_max']) == (134000.0, 254000.0)
+    assert enriched['skills_required'] == 'R, Excel'
+
+def test_stale_cache_is_revalidated_with_etag(fixture_server, tmp_path):
+    server, base = fixture_server
+    url = f'{base}/plain'
+
+    first = make_enricher(tmp_path, cache_ttl=0).fetch(url)
+    second = make_enricher(tmp_path, cache_ttl=0).fetch(url)
+
+    assert second == first
+    assert server.requests == [('/plain', None), ('/plain', '"v1"')]
+
+def test_fresh_cache_skips_the_request(fixture_server, tmp_path):
+    server, base = fixture_server
+    enricher = make_enricher(tmp_path)
+
+    enricher.fetch(f'{base}/plain')
+    enricher.fetch(f'{base}/plain')
+
+    assert len(server.requests) == 1
+
+def test_failed_fetch_leaves_detail_fields_out(fixture_server, tmp_path):
+    server, base = fixture_server
+    job = {'title': 'Actuary', 'company': 'C', 'location': 'USA',
+           'description': 'Actuarial position at C', 'application_url': f'{base}/error'}
+
+    enriched = make_enricher(tmp_path).enrich_job(job)
+
+    assert 'description' not in enriched
+    assert 'skills_required' not in enriched
+    assert 'experience_level' not in enriched
+
+def test_enrich_jobs_keeps_order(fixture_server, tmp_path):
+    server, base = fixture_server
+    jobs = [{'title': 'Actuary', 'company': 'C', 'location': 'USA', 'application_url': f'{base}/{path}'}
+            for path in ['plain', 'next', 'plain']]
+
+    enriched = make_enricher(tmp_path, max_workers=3).enrich_jobs(jobs)
+
+    assert [job['application_url'] for job in enriched] == [job['application_url'] for job in jobs]
+
+def test_parse_detail_page_falls_back_to_meta_description():
+    details = parse_detail_page('<html><head><meta name="description" content="Entry level analyst"></head></html>', 'Analyst')
+
+    assert details['description'] == 'Entry level analyst'
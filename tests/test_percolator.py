@@ -0,0 +1,105 @@
+"""Saved search percolation: anchoring, candidate pruning, dedup and parity with GET /api/jobs."""
+import pytest
+
+from backend.models.job import Job
+from backend.models.saved_search import SavedSearch, SavedSearchMatch
+from backend.percolator import SavedSearchIndex, percolate, search_matches_job
+from backend.queries import jobs_statement
+
+class Search:
+    def __init__(self, id, location=None, job_type=None, tag=None, search=None):
+        self.id = id
+        self.location = location
+        self.job_type = job_type
+        self.tag = tag
+        self.search = search
+
+def job(**fields):
+    defaults = {'title': 'Actuary', 'company': 'Acme Re', 'description': None,
+                'location': 'USA', 'job_type': 'full-time', 'tags': None}
+    defaults.update(fields)
+    return defaults
+
+def test_searches_are_anchored_on_their_most_selective_filter():
+    index = SavedSearchIndex([
+        Search(1, tag='Pricing', search='python', job_type='contract'),
+        Search(2, search='Python', location='London'),
+        Search(3, location='UK', job_type='internship'),
+        Search(4, location='UK'),
+    ])
+
+    assert [search.id for search in index.by_anchor[('tags', 'pri')]] == [1]
+    assert [search.id for search in index.by_anchor[('text', 'pyt')]] == [2]
+    # Too short for a trigram, so the job type anchors it
+    assert [search.id for search in index.by_anchor[('job_type', 'internship')]] == [3]
+    assert [search.id for search in index.unanchored] == [4]
+
+def test_candidates_skip_searches_whose_anchor_the_job_lacks():
+    index = SavedSearchIndex([
+        Search(1, tag='Pricing'),
+        Search(2, search='python'),
+        Search(3, job_type='contract'),
+        Search(4, location='UK'),
+    ])
+
+    candidates = index.candidates(job(title='Python Actuary', tags='Reserving'))
+
+    assert sorted(search.id for search in candidates) == [2, 4]
+    assert [search.id for search in index.match(job(title='Python Actuary', tags='Reserving'))] == [2]
+
+def test_each_candidate_is_returned_once():
+    index = SavedSearchIndex([Search(1, search='act')])
+
+    # 'act' is a trigram of the title, the company and the description
+    candidates = index.candidates(job(title='Actuary', company='Actuarial Co', description='actuarial work'))
+
+    assert [search.id for search in candidates] == [1]
+
+def test_percolate_records_each_pair_once(session):
+    session.add_all([SavedSearch(name='Python', search='python'), SavedSearch(name='Contracts', job_type='contract')])
+    jobs = [Job(title='Python Actuary', company='Acme Re', location='USA', job_type='contract'),
+            Job(title='Actuary', company='Acme Re', location='USA', job_type='full-time')]
+    session.add_all(jobs)
+    session.flush()
+
+    assert percolate(session, jobs) == 2
+    session.commit()
+    assert percolate(session, jobs) == 0
+    jobs[1].job_type = 'contract'
+    session.flush()
+    assert percolate(session, jobs) == 1
+    session.commit()
+
+    assert session.query(SavedSearchMatch).count() == 3
+
+@pytest.mark.parametrize('filters', [
+    {'search': '100%'},
+    {'search': '1_0'},
+    {'search': 'ACME'},
+    {'search': 'école'},
+    {'location': 'U_A'},
+    {'location': 'usa'},
+    {'tag': '%'},
+    {'tag': 'c++'},
+    {'job_type': 'contract'},
+])
+def test_matcher_agrees_with_the_jobs_endpoint(session, filters):
+    rows = [
+        Job(title='Actuary 100%', company='Acme Re', location='USA', job_type='full-time', tags='C++, R'),
+        Job(title='Actuary 1x0', company='acme re', location='UKA', job_type='contract', tags='50% remote'),
+        Job(title='Actuary', company='ÉCOLE Re', location='U_A', job_type='contract', tags=None),
+        Job(title='Actuary', company='école Re', location='Canada', job_type='full-time', tags='Pricing'),
+        Job(title='Actuary 1_0', company='Zeta', location='usa', job_type='full-time', tags='Python'),
+    ]
+    session.add_all(rows)
+    session.commit()
+
+    from_sql = {row.id for row in session.execute(jobs_statement(**filters)).scalars()}
+    search = Search(1, **filters)
+    from_matcher = {row.id for row in rows if search_matches_job(search, row)}
+    # And the index must not prune any of them
+    index = SavedSearchIndex([search])
+    from_index = {row.id for row in rows if index.match(row)}
+
+    assert from_matcher == from_sql
+    assert from_index == from_sql
@@ -0,0 +1,72 @@
+"""Snapshot diffing and changeset application."""
+from backend.models.job import Job
+from backend.snapshot import apply_changeset, diff_snapshots, job_key, load_state
+
+def scraped(title, company='Acme Re', url=None, **fields):
+    job = {'title': title, 'company': company, 'location': 'USA', 'job_type': 'full-time',
+           'tags': 'Actuary', 'description': f'{title} at {company}', 'application_url': url,
+           'source': 'actuary_list', 'posting_date': '2026-10-01T00:00:00'}
+    job.update(fields)
+    return job
+
+def ingest(session, jobs):
+    counts = apply_changeset(session, diff_snapshots(load_state(session), jobs))
+    session.commit()
+    return counts
+
+def test_keys_are_tagged_not_parsed():
+    assert job_key({'application_url': '/jobs/123'}) == ('url', '/jobs/123')
+    assert job_key({'company': 'A|B', 'title': 'C'}) != job_key({'company': 'A', 'title': 'B|C'})
+    assert job_key({'company': 'A', 'title': 'B', 'application_url': ''}) == ('company_title', 'A', 'B')
+
+def test_diff_sorts_jobs_by_what_happened():
+    first = [scraped('Actuary', url='https://x/1'), scraped('Analyst', url='https://x/2')]
+    state = diff_snapshots({}, first)['state']
+
+    second = [scraped('Actuary', url='https://x/1', description='New text'),
+              scraped('Analyst', url='https://x/2', posting_date='2026-10-05T00:00:00'),
+              scraped('Intern', url='https://x/3'),
+              scraped('Intern', url='https://x/3', description='duplicate')]
+    changeset = diff_snapshots(state, second)
+
+    assert [job['title'] for job in changeset['added']] == ['Intern']
+    assert [job['title'] for job in changeset['changed']] == ['Actuary']
+    # posting_date drifts between runs and is not content
+    assert changeset['unchanged'] == 1
+    assert changeset['removed'] == []
+
+def test_rerun_is_a_no_op_and_removal_closes(session):
+    jobs = [scraped('Actuary', url='https://x/1'), scraped('Analyst', url='https://x/2')]
+    assert ingest(session, jobs)['added'] == 2
+
+    counts = ingest(session, jobs)
+    assert (counts['added'], counts['changed'], counts['unchanged']) == (0, 0, 2)
+
+    assert ingest(session, jobs[:1])['closed'] == 1
+    assert session.query(Job).filter_by(title='Analyst').one().status == 'closed'
+
+    counts = ingest(session, jobs)
+    assert (counts['added'], counts['changed']) == (0, 1)
+    assert session.query(Job).filter_by(title='Analyst').one().status == 'open'
+    assert session.query(Job).count() == 2
+
+def test_keys_without_scheme_or_with_pipes(session):
+    jobs = [scraped('Actuary', url='/jobs/123'), scraped('Pricing | Reserving', company='A|B Re')]
+    assert ingest(session, jobs)['added'] == 2
+
+    counts = ingest(session, [])
+    assert counts['closed'] == 2
+    counts = ingest(session, jobs)
+    assert (counts['added'], counts['changed']) == (0, 2)
+    assert session.query(Job).count() == 2
+
+def test_missing_fields_keep_stored_values(session):
+    ingest(session, [scraped('Actuary', url='https://x/1', description='Full description', tags='Pricing')])
+
+    job = scraped('Actuary', url='https://x/1')
+    for field in ['description', 'tags', 'job_type']:
+        del job[field]
+    ingest(session, [job])
+
+    row = session.query(Job).one()
+    assert (row.description, row.tags, row.job_type) == ('Full description', 'Pricing', 'full-time')
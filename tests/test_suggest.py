@@ -0,0 +1,129 @@
+"""Typeahead index: prefix ranking, incremental updates and cross-process refresh."""
+from backend import suggest
+from backend.models.change_counter import bump_version, current_version
+from backend.models.job import Job
+from backend.suggest import SuggestionIndex, build_suggestion_index, job_values, suggestion_index
+
+def values(suggestions):
+    return [(item['value'], item['count']) for item in suggestions]
+
+def count_builds(monkeypatch):
+    builds = []
+    build_contents = suggest._build_contents
+
+    def counted(jobs):
+        builds.append(1)
+        return build_contents(jobs)
+
+    monkeypatch.setattr(suggest, '_build_contents', counted)
+    return builds
+
+def test_prefix_completions_are_ranked_by_count():
+    index = SuggestionIndex()
+    index.build([
+        {'company': 'Acme Re', 'title': 'Actuary', 'location': '🇺🇸 USA\n💰 $100k-$120k', 'tags': 'Pricing, Actuary'},
+        {'company': 'Acme Re', 'title': 'Pricing Actuary', 'location': 'USA', 'tags': 'Pricing'},
+    ])
+
+    assert values(index.suggest('ac')) == [('Acme Re', 2), ('Actuary', 1), ('Actuary', 1)]
+    assert values(index.suggest('pri')) == [('Pricing', 2), ('Pricing Actuary', 1)]
+    # Salary lines are not locations
+    assert index.suggest('$') == []
+
+def test_local_commits_apply_without_a_rebuild(session_factory, monkeypatch):
+    session = session_factory()
+    session.add(Job(title='Actuary', company='Zeta Re', location='USA'))
+    session.commit()
+    build_suggestion_index(session)
+    builds = count_builds(monkeypatch)
+
+    job = Job(title='Pricing Actuary', company='Zephyr Life', location='UK')
+    session.add(job)
+    session.commit()
+    job.company = 'Zed Re'
+    session.commit()
+    session.delete(session.query(Job).filter_by(company='Zeta Re').one())
+    session.commit()
+    session.close()
+
+    assert values(suggestion_index.suggest('ze')) == [('Zed Re', 1)]
+    assert suggestion_index.version == 4
+
+    suggestion_index._refresh(session_factory)
+    assert builds == []
+
+def test_rollback_leaves_index_alone(session_factory):
+    session = session_factory()
+    build_suggestion_index(session)
+    session.add(Job(title='Actuary', company='Zeta Re', location='USA'))
+    session.flush()
+    session.rollback()
+    session.close()
+
+    assert suggestion_index.suggest('ze') == []
+    assert suggestion_index.version == 0
+
+def test_write_from_another_process_triggers_a_rebuild(engine, session_factory, monkeypatch):
+    session = session_factory()
+    build_suggestion_index(session)
+    session.close()
+    builds = count_builds(monkeypatch)
+
+    # What another process's commit leaves behind: the row and a bumped counter,
+    # without any session event firing here
+    with engine.begin() as conn:
+        conn.execute(Job.__table__.insert().values(title='Actuary', company='Zeta Re', location='USA',
+                                                   job_type='full-time', status='open'))
+        bump_version(conn, 'jobs')
+
+    suggestion_index._refresh(session_factory)
+
+    assert builds == [1]
+    assert values(suggestion_index.suggest('ze')) == [('Zeta Re', 1)]
+    with engine.connect() as conn:
+        assert suggestion_index.version == current_version(conn, 'jobs') == 1
+
+def test_commit_read_by_a_rebuild_is_not_counted_twice():
+    job = {'company': 'Acme Re', 'title': 'Actuary', 'location': 'USA', 'tags': None}
+    index = SuggestionIndex()
+    index.build([job], version=1)
+
+    # The commit's after_commit hook runs after the rebuild has read its row
+    index.apply([(1, job_values(job))], 1)
+
+    assert values(index.suggest('acme')) == [('Acme Re', 1)]
+
+def test_commit_during_a_rebuild_is_replayed():
+    index = SuggestionIndex()
+    index.build([], version=1)
+
+    index.begin_build()
+    index.apply([(1, [('company', 'Acme Re')])], 2)
+    # The rebuild read the table at version 1, before that commit
+    index.install(suggest._build_contents([]), 1)
+
+    assert values(index.suggest('acme')) == [('Acme Re', 1)]
+    assert index.version == 2
+
+def test_commits_applied_in_version_order():
+    index = SuggestionIndex()
+    index.build([], version=1)
+
+    index.apply([(-1, [('company', 'Acme Re')])], 3)
+    assert index.version == 1
+    index.apply([(1, [('company', 'Acme Re')]), (1, [('company', 'Acme Re')])], 2)
+
+    assert values(index.suggest('acme')) == [('Acme Re', 1)]
+    assert index.version == 3
+
+def test_first_request_builds_the_index(session_factory):
+    session = session_factory()
+    session.add(Job(title='Actuary', company='Zeta Re', location='USA'))
+    session.commit()
+    session.close()
+    index = SuggestionIndex()
+
+    index.refresh_if_stale(session_factory)
+
+    assert index.ready
+    assert values(index.suggest('ze')) == [('Zeta Re', 1)]